@@ -4,67 +4,88 @@ Compare performance baselines and generate comparison report.
 """
 
 import csv
+import math
 import sys
 from datetime import datetime
 import os
 
+# Metrics compared between baselines, in report order
+METRICS = ('FileOpenTime', 'FileSaveTime', 'MemoryUsage',
+           'TextInsertionTime', 'NavigationTime', 'ScrollingTime',
+           'SearchReplaceTime')
+
+# Comparison keys holding the percentage change for each metric
+CHANGE_KEYS = tuple(f"{metric}_Change" for metric in METRICS)
+
 def load_baselines(csv_file):
-    """Load baseline data from CSV file."""
-    baselines = []
-    with open(csv_file, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            baselines.append(row)
-    return baselines
+    """Load baseline data from CSV file.
+
+    Returns a (column index, rows) pair, where each row is a list of fields
+    and the index maps column names from the header to positions. Blank lines
+    are skipped and short rows are padded with None, as csv.DictReader does.
+    """
+    with open(csv_file, 'r', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        idx = {name: i for i, name in enumerate(header)}
+        width = len(header)
+        rows = [row + [None] * (width - len(row)) for row in reader if row]
+        return idx, rows
 
 def calculate_percentage_change(old, new):
-    """Calculate percentage change between two values."""
+    """Calculate percentage change between two values.
+
+    Returns math.nan when either value is not numeric or old is zero.
+    """
     try:
         old_val = float(old)
         new_val = float(new)
-        if old_val == 0:
-            return "N/A"
-        return ((new_val - old_val) / old_val) * 100
     except (ValueError, TypeError):
-        return "N/A"
+        return math.nan
+    if old_val == 0.0:
+        return math.nan
+    return ((new_val - old_val) / old_val) * 100
 
-def compare_baselines(baselines):
+def compare_baselines(idx, baselines):
     """Compare baselines and generate comparison report."""
     if len(baselines) < 2:
         print("Need at least 2 baselines for comparison")
         return
     
-    # Sort by date
-    baselines.sort(key=lambda x: x['Date'])
-    
-    # Get latest two baselines
-    latest = baselines[-1]
-    previous = baselines[-2]
+    # Get latest two baselines by date in a single scan; ties go to the most
+    # recently appended row, since runs from the same day share a date
+    date_i = idx['Date']
+    latest = previous = None
+    for row in baselines:
+        date = row[date_i]
+        if latest is None or date >= latest[date_i]:
+            previous, latest = latest, row
+        elif previous is None or date >= previous[date_i]:
+            previous = row
     
     # Generate comparison
+    commit_i = idx['CommitHash']
+    config_i = idx['BuildConfig']
     comparison = {
-        'Date': latest['Date'],
-        'PreviousDate': previous['Date'],
-        'CommitHash': latest['CommitHash'],
-        'PreviousCommitHash': previous['CommitHash'],
-        'BuildConfig': latest['BuildConfig'],
-        'PreviousBuildConfig': previous['BuildConfig']
+        'Date': latest[date_i],
+        'PreviousDate': previous[date_i],
+        'CommitHash': latest[commit_i],
+        'PreviousCommitHash': previous[commit_i],
+        'BuildConfig': latest[config_i],
+        'PreviousBuildConfig': previous[config_i]
     }
     
     # Compare metrics
-    metrics = ['FileOpenTime', 'FileSaveTime', 'MemoryUsage', 
-              'TextInsertionTime', 'NavigationTime', 'ScrollingTime', 
-              'SearchReplaceTime']
-    
-    for metric in metrics:
-        comparison[f"{metric}_Change"] = calculate_percentage_change(
-            previous[metric], latest[metric])
+    for metric, change_key in zip(METRICS, CHANGE_KEYS):
+        i = idx[metric]
+        comparison[change_key] = calculate_percentage_change(
+            previous[i], latest[i])
     
     return comparison
 
 def generate_markdown_report(comparison):
     """Generate markdown report from comparison data."""
-    report = f"""# Performance Comparison Report
+    parts = [f"""# Performance Comparison Report
 
 ## Overview
 - **Date**: {comparison['Date']}
@@ -78,19 +99,14 @@ def generate_markdown_report(comparison):
 
 | Metric | Change |
 |--------|--------|
-"""
-    
-    metrics = ['FileOpenTime', 'FileSaveTime', 'MemoryUsage', 
-              'TextInsertionTime', 'NavigationTime', 'ScrollingTime', 
-              'SearchReplaceTime']
+"""]
     
-    for metric in metrics:
-        change = comparison[f"{metric}_Change"]
-        if change != "N/A":
-            change = f"{change:+.2f}%"
-        report += f"| {metric} | {change} |\n"
+    for metric, change_key in zip(METRICS, CHANGE_KEYS):
+        change = comparison[change_key]
+        change = "N/A" if math.isnan(change) else f"{change:+.2f}%"
+        parts.append(f"| {metric} | {change} |\n")
     
-    return report
+    return ''.join(parts)
 
 def main():
     if len(sys.argv) != 2:
@@ -98,8 +114,8 @@ def main():
         sys.exit(1)
     
     baseline_file = sys.argv[1]
-    baselines = load_baselines(baseline_file)
-    comparison = compare_baselines(baselines)
+    idx, baselines = load_baselines(baseline_file)
+    comparison = compare_baselines(idx, baselines)
     
     if comparison:
         report = generate_markdown_report(comparison)
@@ -4,96 +4,256 @@ Extract performance metrics from test output and generate CSV baseline file.
 """
 
 import csv
+import functools
+import json
+import mmap
 import re
+import socket
+import stat
 import sys
+import time
 from datetime import datetime
 import subprocess
 import platform
 import os
 
+# Regex for all metrics in the test output, one named group per metric, so
+# the whole log can be scanned in a single pass. It matches bytes so it can
+# run directly over a memory-mapped log.
+_METRIC_RE = re.compile(b'|'.join([
+    rb'File open time: (?P<FileOpenTime>\d+)ms',
+    rb'File save time: (?P<FileSaveTime>\d+)ms',
+    rb'Memory usage: (?P<MemoryUsage>\d+)MB',
+    rb'Text insertion time: (?P<TextInsertionTime>\d+)ms',
+    rb'Navigation time: (?P<NavigationTime>\d+)ms',
+    rb'Scrolling time: (?P<ScrollingTime>\d+)ms',
+    rb'Search/Replace time: (?P<SearchReplaceTime>\d+)ms'
+]))
+
+# Columns of the baseline CSV, in file order
+FIELDNAMES = ['Date', 'CommitHash', 'CPUModel', 'RAM', 'OS', 'BuildConfig',
+              'FileOpenTime', 'FileSaveTime', 'MemoryUsage', 'TextInsertionTime',
+              'NavigationTime', 'ScrollingTime', 'SearchReplaceTime']
+
+# System info is cached on disk per host and refreshed after a day
+SYSINFO_CACHE_FILE = os.path.expanduser('~/.cache/perf_baseline/sysinfo.json')
+SYSINFO_CACHE_MAX_AGE = 24 * 60 * 60
+
+def _query_system_info():
+    """Query CPU model and RAM size from the operating system."""
+    system = platform.system()
+    if system == "Windows":
+        import ctypes
+        import winreg
+        
+        # Get CPU info from the registry (same brand string wmic reports)
+        key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE,
+                             r"HARDWARE\DESCRIPTION\System\CentralProcessor\0")
+        try:
+            cpu_model = winreg.QueryValueEx(key, "ProcessorNameString")[0].strip()
+        finally:
+            winreg.CloseKey(key)
+        
+        # Get RAM info
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [('dwLength', ctypes.c_ulong),
+                        ('dwMemoryLoad', ctypes.c_ulong),
+                        ('ullTotalPhys', ctypes.c_ulonglong),
+                        ('ullAvailPhys', ctypes.c_ulonglong),
+                        ('ullTotalPageFile', ctypes.c_ulonglong),
+                        ('ullAvailPageFile', ctypes.c_ulonglong),
+                        ('ullTotalVirtual', ctypes.c_ulonglong),
+                        ('ullAvailVirtual', ctypes.c_ulonglong),
+                        ('ullAvailExtendedVirtual', ctypes.c_ulonglong)]
+        
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+        if not ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            raise ctypes.WinError()
+        ram_bytes = status.ullTotalPhys
+    elif system == "Darwin":
+        cpu_model = subprocess.check_output(
+            ["sysctl", "-n", "machdep.cpu.brand_string"]).decode().strip()
+        ram_bytes = int(subprocess.check_output(["sysctl", "-n", "hw.memsize"]).decode())
+    else:  # Linux
+        # Get CPU info
+        cpu_model = "Unknown"
+        with open('/proc/cpuinfo', 'r') as f:
+            for line in f:
+                if line.startswith('model name'):
+                    cpu_model = line.split(':', 1)[1].strip()
+                    break
+        
+        # Get RAM info
+        ram_bytes = 0
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                if line.startswith('MemTotal:'):
+                    ram_bytes = int(line.split()[1]) * 1024  # Reported in kB
+                    break
+    
+    ram_gb = f"{ram_bytes // (1024**3)}GB"
+    return cpu_model, ram_gb
+
+def _load_sysinfo_cache():
+    """Load the on-disk system info cache, or an empty one if unreadable."""
+    try:
+        with open(SYSINFO_CACHE_FILE, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+@functools.lru_cache(maxsize=1)
 def get_system_info():
     """Get system information for baseline."""
-    # Get CPU info
-    if platform.system() == "Windows":
-        cpu_info = subprocess.check_output("wmic cpu get name", shell=True).decode()
-        cpu_model = cpu_info.split('\n')[1].strip()
-    else:  # Linux/macOS
-        cpu_info = subprocess.check_output("cat /proc/cpuinfo | grep 'model name' | uniq", shell=True).decode()
-        cpu_model = cpu_info.split(':')[1].strip()
+    hostname = socket.gethostname()
+    cache = _load_sysinfo_cache()
+    entry = cache.get(hostname)
+    try:
+        if time.time() - entry['Timestamp'] < SYSINFO_CACHE_MAX_AGE:
+            return entry['CPUModel'], entry['RAM']
+    except (TypeError, KeyError):
+        pass
     
-    # Get RAM info
-    if platform.system() == "Windows":
-        ram_info = subprocess.check_output("wmic computersystem get totalphysicalmemory", shell=True).decode()
-        ram_bytes = int(ram_info.split('\n')[1].strip())
-        ram_gb = f"{ram_bytes // (1024**3)}GB"
-    else:  # Linux/macOS
-        ram_info = subprocess.check_output("free -b", shell=True).decode()
-        ram_bytes = int(ram_info.split('\n')[1].split()[1])
-        ram_gb = f"{ram_bytes // (1024**3)}GB"
+    cpu_model, ram_gb = _query_system_info()
+    cache[hostname] = {'CPUModel': cpu_model, 'RAM': ram_gb, 'Timestamp': time.time()}
+    try:
+        os.makedirs(os.path.dirname(SYSINFO_CACHE_FILE), exist_ok=True)
+        with open(SYSINFO_CACHE_FILE, 'w') as f:
+            json.dump(cache, f)
+    except OSError:
+        pass  # Caching is best effort
     
     return cpu_model, ram_gb
 
+def _read_text(path):
+    """Read a small text file, or return None if it does not exist."""
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+        return None
+
+def _find_git_dir(start):
+    """Find the .git directory for the repository containing start."""
+    path = os.path.abspath(start)
+    while True:
+        git_path = os.path.join(path, '.git')
+        try:
+            git_stat = os.stat(git_path)
+        except FileNotFoundError:
+            git_stat = None
+        
+        if git_stat is not None:
+            if stat.S_ISDIR(git_stat.st_mode):
+                return git_path
+            # Worktrees and submodules use a "gitdir: <path>" file
+            content = _read_text(git_path) or ''
+            if content.startswith('gitdir:'):
+                return os.path.join(path, content[len('gitdir:'):].strip())
+            return None
+        
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+def _read_git_head(git_dir):
+    """Resolve HEAD to a commit hash by reading the repository files."""
+    head = _read_text(os.path.join(git_dir, 'HEAD'))
+    if head is None:
+        return None
+    if not head.startswith('ref:'):
+        return head  # Detached HEAD
+    ref = head[len('ref:'):].strip()
+    
+    # Refs are shared with the main repository for worktrees
+    common_dir = _read_text(os.path.join(git_dir, 'commondir'))
+    common_dir = os.path.join(git_dir, common_dir) if common_dir else git_dir
+    
+    for base in (git_dir, common_dir):
+        commit_hash = _read_text(os.path.join(base, ref))
+        if commit_hash:
+            return commit_hash
+    
+    try:
+        with open(os.path.join(common_dir, 'packed-refs'), 'r') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2 and parts[1] == ref:
+                    return parts[0]
+    except FileNotFoundError:
+        pass
+    return None
+
+@functools.lru_cache(maxsize=1)
 def get_git_commit_hash():
     """Get current git commit hash."""
+    # Read the hash from .git directly to avoid spawning git
+    try:
+        git_dir = _find_git_dir(os.getcwd())
+        if git_dir:
+            commit_hash = _read_git_head(git_dir)
+            if commit_hash:
+                return commit_hash
+    except OSError:
+        pass
+    
     try:
         return subprocess.check_output("git rev-parse HEAD", shell=True).decode().strip()
     except:
         return "TBD"
 
-def extract_metrics(input_file, output_file, build_config):
-    """Extract metrics from test output and write to CSV."""
+def extract_metrics(input_file, build_config):
+    """Extract metrics from test output into a baseline row dict."""
+    cpu_model, ram = get_system_info()
     metrics = {
         'Date': datetime.now().strftime('%Y-%m-%d'),
         'CommitHash': get_git_commit_hash(),
-        'CPUModel': get_system_info()[0],
-        'RAM': get_system_info()[1],
+        'CPUModel': cpu_model,
+        'RAM': ram,
         'OS': f"{platform.system()} {platform.release()}",
         'BuildConfig': build_config
     }
     
-    # Read test output
-    with open(input_file, 'r') as f:
-        content = f.read()
-    
-    # Extract metrics using regex patterns
-    patterns = {
-        'FileOpenTime': r'File open time: (\d+)ms',
-        'FileSaveTime': r'File save time: (\d+)ms',
-        'MemoryUsage': r'Memory usage: (\d+)MB',
-        'TextInsertionTime': r'Text insertion time: (\d+)ms',
-        'NavigationTime': r'Navigation time: (\d+)ms',
-        'ScrollingTime': r'Scrolling time: (\d+)ms',
-        'SearchReplaceTime': r'Search/Replace time: (\d+)ms'
-    }
-    
-    for metric, pattern in patterns.items():
-        match = re.search(pattern, content)
-        metrics[metric] = match.group(1) if match else 'N/A'
+    # Extract all metrics in a single pass; the first occurrence of each wins.
+    # The log is memory-mapped so it is never copied into a Python string.
+    found = {}
+    with open(input_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size > 0:  # Empty files cannot be mapped
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for match in _METRIC_RE.finditer(mm):
+                    found.setdefault(match.lastgroup,
+                                     match.group(match.lastgroup).decode('ascii'))
     
-    # Write to CSV
-    fieldnames = ['Date', 'CommitHash', 'CPUModel', 'RAM', 'OS', 'BuildConfig',
-                 'FileOpenTime', 'FileSaveTime', 'MemoryUsage', 'TextInsertionTime',
-                 'NavigationTime', 'ScrollingTime', 'SearchReplaceTime']
+    for metric in _METRIC_RE.groupindex:
+        metrics[metric] = found.get(metric, 'N/A')
     
+    return metrics
+
+def flush_metrics(rows, output_file):
+    """Append baseline rows to the CSV file in one open and write."""
     file_exists = os.path.isfile(output_file)
     
     with open(output_file, 'a', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer = csv.writer(f)
         if not file_exists:
-            writer.writeheader()
-        writer.writerow(metrics)
+            writer.writerow(FIELDNAMES)
+        writer.writerows([row[name] for name in FIELDNAMES] for row in rows)
 
 def main():
-    if len(sys.argv) != 3:
-        print("Usage: python extract_performance_metrics.py <input_file> <build_config>")
+    if len(sys.argv) < 3:
+        print("Usage: python extract_performance_metrics.py <input_file> [<input_file> ...] <build_config>")
         sys.exit(1)
     
-    input_file = sys.argv[1]
-    build_config = sys.argv[2]
+    input_files = sys.argv[1:-1]
+    build_config = sys.argv[-1]
     output_file = 'large_file_baselines.csv'
     
-    extract_metrics(input_file, output_file, build_config)
+    rows = [extract_metrics(input_file, build_config) for input_file in input_files]
+    flush_metrics(rows, output_file)
     print(f"Metrics extracted and written to {output_file}")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -4,25 +4,59 @@ Generate performance trend visualizations from baseline data.
 """
 
 import csv
+import math
 import sys
-import matplotlib.pyplot as plt
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import repeat
+from operator import itemgetter
 import os
 
+# pandas, matplotlib and pyarrow are imported inside the functions that use
+# them, so the --export-svg path runs on the standard library alone
+
+# Metrics to plot
+METRICS = ('FileOpenTime', 'FileSaveTime', 'MemoryUsage',
+           'TextInsertionTime', 'NavigationTime', 'ScrollingTime',
+           'SearchReplaceTime')
+
+# SVG canvas size and plot margin, in pixels
+SVG_WIDTH = 1200
+SVG_HEIGHT = 600
+SVG_MARGIN = 60
+
 def load_baselines(csv_file):
-    """Load baseline data from CSV file."""
-    return pd.read_csv(csv_file)
+    """Load baseline data from CSV file.
+
+    Uses pyarrow's multi-threaded CSV reader when available. Falls back to
+    pd.read_csv when pyarrow is missing or rejects the file, e.g. a truncated
+    row, which pandas pads with NaN.
+    """
+    import pandas as pd
+    try:
+        import pyarrow
+        import pyarrow.csv as pa_csv
+    except ImportError:  # pyarrow is optional
+        return pd.read_csv(csv_file)
+    
+    try:
+        return pa_csv.read_csv(csv_file).to_pandas()
+    except pyarrow.ArrowInvalid:
+        return pd.read_csv(csv_file)
 
 def plot_metric_trend(df, metric, output_file):
-    """Plot trend for a specific metric."""
-    plt.figure(figsize=(12, 6))
+    """Plot trend for a specific metric.
+
+    Expects df['Date'] to already hold datetime values.
+    """
+    import matplotlib
+    matplotlib.use('Agg')  # Render straight to files; no GUI backend needed
+    import matplotlib.pyplot as plt
     
-    # Convert date strings to datetime objects
-    dates = pd.to_datetime(df['Date'])
+    plt.figure(figsize=(12, 6))
     
     # Plot the metric
-    plt.plot(dates, df[metric], marker='o', linestyle='-', linewidth=2)
+    plt.plot(df['Date'], df[metric], marker='o', linestyle='-', linewidth=2)
     
     # Customize the plot
     plt.title(f'{metric} Trend Over Time')
@@ -42,30 +76,131 @@ def plot_metric_trend(df, metric, output_file):
 
 def generate_trend_plots(baseline_file):
     """Generate trend plots for all metrics."""
+    import pandas as pd
+    
     # Load data
     df = load_baselines(baseline_file)
     
+    # Convert date strings to datetime objects once for all plots
+    df['Date'] = pd.to_datetime(df['Date'])
+    
     # Create output directory if it doesn't exist
     os.makedirs('benchmarks', exist_ok=True)
     
-    # Metrics to plot
-    metrics = ['FileOpenTime', 'FileSaveTime', 'MemoryUsage', 
-              'TextInsertionTime', 'NavigationTime', 'ScrollingTime', 
-              'SearchReplaceTime']
+    # Generate plots for each metric in parallel; rendering is CPU-bound and
+    # each plot is independent
+    output_files = [f'benchmarks/performance_trends_{metric}.png' for metric in METRICS]
+    max_workers = min(len(METRICS), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(plot_metric_trend, repeat(df), METRICS, output_files)
+        for metric, _ in zip(METRICS, results):
+            print(f"Generated trend plot for {metric}")
+
+def load_metric_points(csv_file):
+    """Load (date, value) points for every metric in a single CSV pass.
+
+    Rows with an unparseable date are skipped, as are values that are not
+    finite numbers (including 'nan' and 'inf', which float() accepts).
+    """
+    points = {metric: [] for metric in METRICS}
+    with open(csv_file, 'r', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        idx = {name: i for i, name in enumerate(header)}
+        date_i = idx['Date']
+        columns = [(points[metric], idx[metric]) for metric in METRICS]
+        
+        for row in reader:
+            try:
+                date = datetime.strptime(row[date_i], '%Y-%m-%d')
+            except (IndexError, ValueError):
+                continue
+            for metric_points, i in columns:
+                try:
+                    value = float(row[i])
+                except (IndexError, ValueError):
+                    continue
+                if math.isfinite(value):
+                    metric_points.append((date, value))
+    
+    for metric_points in points.values():
+        # Stable sort on date alone keeps same-day runs in CSV order
+        metric_points.sort(key=itemgetter(0))
+    return points
+
+def write_svg_trend(points, metric, output_file):
+    """Write a minimal SVG line chart of (date, value) points."""
+    left, top = SVG_MARGIN, SVG_MARGIN
+    right, bottom = SVG_WIDTH - SVG_MARGIN, SVG_HEIGHT - SVG_MARGIN
+    
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{SVG_WIDTH}" '
+        f'height="{SVG_HEIGHT}" viewBox="0 0 {SVG_WIDTH} {SVG_HEIGHT}">\n',
+        f'<rect width="{SVG_WIDTH}" height="{SVG_HEIGHT}" fill="white"/>\n',
+        f'<text x="{SVG_WIDTH / 2}" y="{top / 2}" text-anchor="middle" '
+        f'font-family="sans-serif" font-size="18">{metric} Trend Over Time</text>\n',
+        f'<rect x="{left}" y="{top}" width="{right - left}" height="{bottom - top}" '
+        f'fill="none" stroke="#999"/>\n',
+    ]
+    
+    if points:
+        first_date, last_date = points[0][0], points[-1][0]
+        values = [value for _, value in points]
+        lo, hi = min(values), max(values)
+        date_span = (last_date - first_date).total_seconds() or 1.0
+        value_span = (hi - lo) or 1.0
+        
+        coords = []
+        for date, value in points:
+            x = left + (date - first_date).total_seconds() / date_span * (right - left)
+            y = bottom - (value - lo) / value_span * (bottom - top)
+            coords.append((x, y))
+        
+        polyline = ' '.join(f"{x:.1f},{y:.1f}" for x, y in coords)
+        parts.append(f'<polyline points="{polyline}" fill="none" '
+                     f'stroke="#1f77b4" stroke-width="2"/>\n')
+        parts.extend(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="4" fill="#1f77b4"/>\n'
+                     for x, y in coords)
+        
+        # Axis labels: value range on the left, date range along the bottom
+        label = 'font-family="sans-serif" font-size="12"'
+        parts.append(f'<text x="{left - 5}" y="{top + 4}" text-anchor="end" {label}>{hi:g}</text>\n')
+        parts.append(f'<text x="{left - 5}" y="{bottom + 4}" text-anchor="end" {label}>{lo:g}</text>\n')
+        parts.append(f'<text x="{left}" y="{bottom + 20}" {label}>{first_date:%Y-%m-%d}</text>\n')
+        parts.append(f'<text x="{right}" y="{bottom + 20}" text-anchor="end" {label}>'
+                     f'{last_date:%Y-%m-%d}</text>\n')
     
-    # Generate plots for each metric
-    for metric in metrics:
-        output_file = f'benchmarks/performance_trends_{metric}.png'
-        plot_metric_trend(df, metric, output_file)
-        print(f"Generated trend plot for {metric}")
+    parts.append('</svg>\n')
+    with open(output_file, 'w') as f:
+        f.write(''.join(parts))
+
+def export_trend_svgs(baseline_file):
+    """Export SVG trend charts for all metrics without pandas or matplotlib."""
+    points = load_metric_points(baseline_file)
+    
+    # Create output directory if it doesn't exist
+    os.makedirs('benchmarks', exist_ok=True)
+    
+    for metric in METRICS:
+        output_file = f'benchmarks/performance_trends_{metric}.svg'
+        write_svg_trend(points[metric], metric, output_file)
+        print(f"Exported trend SVG for {metric}")
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python visualize_trends.py <baseline_file>")
+    args = sys.argv[1:]
+    export_svg = '--export-svg' in args
+    if export_svg:
+        args.remove('--export-svg')
+    
+    if len(args) != 1:
+        print("Usage: python visualize_trends.py [--export-svg] <baseline_file>")
         sys.exit(1)
     
-    baseline_file = sys.argv[1]
-    generate_trend_plots(baseline_file)
+    baseline_file = args[0]
+    if export_svg:
+        export_trend_svgs(baseline_file)
+    else:
+        generate_trend_plots(baseline_file)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file